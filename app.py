@@ -4,14 +4,35 @@ Run: streamlit run app.py
 """
 import streamlit as st
 
-from src.agent import run_agent
+from src.agent import run_agent, run_agent_stream
+from src.data_loader import get_sheets_client_cached, load_all_sheets
+from src.sync import set_on_data_changed
 
 
-def _rerun():
-    try:
-        st.rerun()
-    except AttributeError:
-        st.experimental_rerun()
+@st.cache_resource(show_spinner=False)
+def _sheets_client():
+    """Build the Sheets client once per session worker (credential read + auth are slow)."""
+    return get_sheets_client_cached()
+
+
+def _invalidate_data():
+    st.session_state["data"] = None
+
+
+def _get_data():
+    """Load all datasets once per session; writes invalidate via set_on_data_changed."""
+    if st.session_state.get("data") is None:
+        st.session_state["data"] = load_all_sheets(_sheets_client())
+    return st.session_state["data"]
+
+
+set_on_data_changed(_invalidate_data)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_agent(prompt: str):
+    """Memoize agent replies by prompt so repeated queries (e.g. sidebar buttons) skip the round-trip."""
+    return run_agent(prompt, client=_sheets_client(), data=_get_data())
 
 
 st.set_page_config(page_title="Drone Operations Coordinator", page_icon="🚁", layout="centered")
@@ -22,48 +43,25 @@ st.caption("Skylark Drones — Roster, assignments, fleet, and conflict detectio
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-# Show chat history
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.markdown(msg["content"])
-
-# Input
-if prompt := st.chat_input("Ask about pilots, drones, assignments, conflicts, or status updates..."):
+def _sidebar_send(prompt: str):
+    """Append user turn + agent reply in one batch; the button's own rerun renders both."""
     st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-
-    with st.chat_message("assistant"):
-        try:
-            reply, _ = run_agent(prompt)
-            st.markdown(reply)
-        except Exception as e:
-            st.error(f"Error: {e}")
-            reply = str(e)
+    try:
+        reply, _ = _cached_agent(prompt)
+    except Exception as e:
+        reply = str(e)
     st.session_state.messages.append({"role": "assistant", "content": reply})
 
+
 # Sidebar
 with st.sidebar:
     st.header("Quick actions")
     if st.button("Check conflicts"):
-        st.session_state.messages.append({"role": "user", "content": "Check conflicts"})
-        try:
-            reply, _ = run_agent("Check conflicts")
-        except Exception as e:
-            reply = str(e)
-        st.session_state.messages.append({"role": "assistant", "content": reply})
-        _rerun()
+        _sidebar_send("Check conflicts")
     if st.button("List missions"):
-        st.session_state.messages.append({"role": "user", "content": "List all projects"})
-        try:
-            reply, _ = run_agent("List all projects")
-        except Exception as e:
-            reply = str(e)
-        st.session_state.messages.append({"role": "assistant", "content": reply})
-        _rerun()
+        _sidebar_send("List all projects")
     if st.button("Clear chat"):
         st.session_state.messages = []
-        _rerun()
     st.divider()
     with st.expander("What can I ask?"):
         st.markdown("- *Who is available in Bangalore?*")
@@ -74,3 +72,28 @@ with st.sidebar:
         st.markdown("- *Check conflicts*")
         st.markdown("- *Set pilot P004 status to On Leave*")
         st.markdown("- *Confirm reassignment PRJ002 to P002 and D003*")
+
+# Chat history + input live in a fragment so chat interactions rerun only
+# this panel, not the whole page (st.fragment is stable since Streamlit 1.37).
+@st.fragment
+def chat_panel():
+    for msg in st.session_state.messages:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
+    if prompt := st.chat_input("Ask about pilots, drones, assignments, conflicts, or status updates..."):
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        with st.chat_message("assistant"):
+            try:
+                reply = st.write_stream(run_agent_stream(prompt, client=_sheets_client(), data=_get_data()))
+            except Exception as e:
+                st.error(f"Error: {e}")
+                reply = str(e)
+        st.session_state.messages.append({"role": "assistant", "content": reply})
+
+
+chat_panel()
+
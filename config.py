@@ -6,7 +6,30 @@ import os
 import re
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env only once per process; re-imports (Streamlit hot-reload,
+# test collection) skip the filesystem walk and tokenization.
+if not os.environ.get("CONFIG_LOADED"):
+    load_dotenv()
+    os.environ["CONFIG_LOADED"] = "1"
+
+# Compiled once; matches the ID segment of a Sheets URL, e.g.
+# https://docs.google.com/spreadsheets/d/1ABC...xyz/edit
+_SHEET_ID_RE = re.compile(r"/d/([a-zA-Z0-9_-]+)")
+
+__all__ = [
+    "GOOGLE_SHEET_ID_PILOTS",
+    "GOOGLE_SHEET_ID_DRONES",
+    "GOOGLE_SHEET_ID_MISSIONS",
+    "GOOGLE_SHEET_ID_ASSIGNMENTS",
+    "SINGLE_SHEET_ID",
+    "SHEET_NAME_PILOTS",
+    "SHEET_NAME_DRONES",
+    "SHEET_NAME_MISSIONS",
+    "SHEET_NAME_ASSIGNMENTS",
+    "GOOGLE_CREDENTIALS_PATH",
+    "OPENAI_API_KEY",
+    "USE_LOCAL_CSV",
+]
 
 
 def _extract_sheet_id(value: str) -> str:
@@ -14,8 +37,10 @@ def _extract_sheet_id(value: str) -> str:
     if not value or not value.strip():
         return ""
     value = value.strip()
-    # e.g. https://docs.google.com/spreadsheets/d/1ABC...xyz/edit
-    m = re.search(r"/d/([a-zA-Z0-9_-]+)", value)
+    # Fast path: raw IDs (the common case) skip the regex engine entirely
+    if "/d/" not in value:
+        return value
+    m = _SHEET_ID_RE.search(value)
     if m:
         return m.group(1)
     return value
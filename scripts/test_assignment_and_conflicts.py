@@ -8,12 +8,16 @@ import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(ROOT))
-os.chdir(ROOT)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if Path.cwd() != ROOT:
+    os.chdir(ROOT)
 
-from src.data_loader import load_pilots, load_drones, load_missions, load_assignments, get_sheets_client_cached
+from src.data_loader import load_all_sheets, get_sheets_client_cached
 from src.assignments_engine import (
     build_assignments_from_roster_and_missions,
+    build_pilot_index,
+    build_drone_index,
     match_pilots_to_mission,
     match_drones_to_mission,
     suggest_assignment,
@@ -25,16 +29,24 @@ from src.conflicts import detect_all_conflicts
 
 def load_data():
     client = get_sheets_client_cached()
-    pilots = load_pilots(client)
-    drones = load_drones(client)
-    missions = load_missions(client)
-    raw_assignments = load_assignments(client)
+    pilots, drones, missions, raw_assignments = load_all_sheets(client)
     assignments = raw_assignments if raw_assignments else build_assignments_from_roster_and_missions(
         pilots, missions
     )
     return pilots, drones, missions, assignments
 
 
+_DATA = None
+
+
+def load_data_once():
+    """Load the shared dataset once; every test reuses the same tuple."""
+    global _DATA
+    if _DATA is None:
+        _DATA = load_data()
+    return _DATA
+
+
 def test_date_overlap():
     print("--- Test: date overlap logic ---")
     assert _dates_overlap("2026-02-06", "2026-02-08", "2026-02-07", "2026-02-09") is True
@@ -45,7 +57,7 @@ def test_date_overlap():
 
 def test_match_pilots_and_drones():
     print("--- Test: match pilots/drones to mission ---")
-    pilots, drones, missions, assignments = load_data()
+    pilots, drones, missions, assignments = load_data_once()
     assert len(pilots) >= 1 and len(missions) >= 1
     mission = missions[0]
     project_id = (mission.get("project_id") or "").strip()
@@ -57,12 +69,17 @@ def test_match_pilots_and_drones():
 
 def test_suggest_and_urgent():
     print("--- Test: suggest_assignment and urgent_reassign ---")
-    pilots, drones, missions, assignments = load_data()
+    pilots, drones, missions, assignments = load_data_once()
+    pilot_index = build_pilot_index(pilots)
+    drone_index = build_drone_index(drones)
     for m in missions:
         pid = (m.get("project_id") or "").strip()
         if not pid:
             continue
-        pilot, drone, reasons = suggest_assignment(pilots, drones, missions, assignments, pid)
+        pilot, drone, reasons = suggest_assignment(
+            pilots, drones, missions, assignments, pid,
+            pilot_index=pilot_index, drone_index=drone_index,
+        )
         print(f"  Suggest {pid}: pilot={pilot.get('name') if pilot else None}, drone={drone.get('drone_id') if drone else None}")
         if reasons:
             for r in reasons:
@@ -76,7 +93,7 @@ def test_suggest_and_urgent():
 
 def test_conflicts_with_live_data():
     print("--- Test: detect_all_conflicts (live data) ---")
-    pilots, drones, missions, assignments = load_data()
+    pilots, drones, missions, assignments = load_data_once()
     conflicts = detect_all_conflicts(pilots, drones, missions, assignments)
     print(f"  Found {len(conflicts)} conflict(s).")
     for c in conflicts:
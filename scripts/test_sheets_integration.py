@@ -10,8 +10,10 @@ from pathlib import Path
 
 # Run from project root so config and imports resolve consistently
 ROOT = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(ROOT))
-os.chdir(ROOT)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if Path.cwd() != ROOT:
+    os.chdir(ROOT)
 
 # Load env before importing config (dotenv in config is loaded on import)
 import config
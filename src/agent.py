@@ -5,11 +5,13 @@ Uses rule-based routing + optional OpenAI for natural language. Falls back to ru
 import re
 from typing import Any, List, Optional, Tuple
 
-from src.data_loader import load_pilots, load_drones, load_missions, load_assignments, get_sheets_client_cached
-from src.roster import query_pilots, get_pilot_by_id
+from src.data_loader import load_all_sheets, get_sheets_client_cached
+from src.roster import _EMPTY_ASSIGN, query_pilots, get_pilot_by_id
 from src.fleet import query_drones, get_drone_by_id
 from src.assignments_engine import (
+    build_assignment_index,
     build_assignments_from_roster_and_missions,
+    index_by_id,
     suggest_assignment,
     urgent_reassign,
 )
@@ -17,14 +19,74 @@ from src.conflicts import detect_all_conflicts
 from src.sync import update_pilot_status, update_pilot_assignment, update_drone_status, update_drone_assignment
 
 
+# Compiled once; every chat turn hits several of these
+_RE_WORDS = re.compile(r"\w+")
+_RE_PROJ = re.compile(r"\b(PRJ\d+)\b", re.I)
+_RE_PILOT = re.compile(r"\b(P\d+)\b", re.I)
+_RE_DRONE = re.compile(r"\b(D\d+)\b", re.I)
+_RE_PRJ_LOWER = re.compile(r"prj\d+")
+
+
 def _normalize(s: str) -> str:
     return (s or "").strip().lower()
 
 
-def _intent_keywords(user_message: str) -> set:
-    t = _normalize(user_message)
-    words = set(re.findall(r"\w+", t))
-    return words
+# Keyword -> intent lookup; the keyword sets per intent are disjoint, so a
+# single set intersection with the message words finds every candidate intent
+_INTENT_KEYWORDS = {}
+for _intent, _words in (
+    ("urgent_reassign", ("urgent", "emergency", "asap", "reassign", "reassignment")),
+    ("conflicts", ("conflict", "conflicts", "double", "overlap", "mismatch", "issue", "problem", "warning")),
+    ("roster", ("pilot", "roster", "availability", "available", "leave", "certification", "skill")),
+    ("fleet", ("drone", "fleet", "inventory", "maintenance", "deploy")),
+    ("status_update", ("set", "update", "change", "mark", "status")),
+    ("help", ("help", "how")),
+):
+    for _w in _words:
+        _INTENT_KEYWORDS[_w] = _intent
+
+# Order of the original if-ladder; "assignment" is a project-id special case
+_INTENT_PRIORITY = ("urgent_reassign", "conflicts", "assignment", "roster", "fleet", "status_update", "help")
+_ASSIGNMENT_CUES = frozenset({"assign", "match", "suggest", "who", "which", "pilot", "drone", "for"})
+
+
+# Entity keywords extracted from messages in the roster/fleet/status branches.
+# A single alternation scan (longest-first, so "unavailable" wins over the
+# "available" substring) replaces ~18 separate `in user_message.lower()` passes.
+_LOCATIONS = ("Bangalore", "Mumbai", "Delhi", "Chennai")
+_SKILLS = ("Mapping", "Survey", "Inspection", "Thermal")
+_CAPABILITIES = ("LiDAR", "RGB", "Thermal")
+_STATUSES = ("Available", "On Leave", "Unavailable", "Assigned", "Maintenance")
+
+_KEYWORD_TABLE: dict = {}
+for _cat, _vals in (
+    ("location", _LOCATIONS),
+    ("skill", _SKILLS),
+    ("capability", _CAPABILITIES),
+    ("status", _STATUSES),
+    ("cert", ("DGCA",)),
+):
+    for _v in _vals:
+        _KEYWORD_TABLE.setdefault(_v.lower(), []).append((_cat, _v))
+_KEYWORD_TABLE.setdefault("night", []).append(("cert", "Night Ops"))
+
+_RE_KEYWORDS = re.compile(
+    "|".join(sorted(map(re.escape, _KEYWORD_TABLE), key=len, reverse=True))
+)
+
+
+def _scan_keywords(msg_lc: str) -> dict:
+    """One multi-pattern pass over the lowered message -> {category: set of canonical values}."""
+    found: dict = {}
+    for m in _RE_KEYWORDS.finditer(msg_lc):
+        for cat, val in _KEYWORD_TABLE[m.group(0)]:
+            found.setdefault(cat, set()).add(val)
+    return found
+
+
+def _first(options: tuple, found) -> Optional[str]:
+    """First option (in the branch's priority order) present in the scanned set."""
+    return next((o for o in options if o in found), None)
 
 
 def get_intent(user_message: str) -> str:
@@ -32,33 +94,22 @@ def get_intent(user_message: str) -> str:
     Classify user intent: roster, assignment, fleet, conflicts, urgent_reassign, status_update, help, unknown.
     """
     msg = _normalize(user_message)
-    k = _intent_keywords(user_message)
+    return _get_intent(msg, set(_RE_WORDS.findall(msg)))
+
 
+def _get_intent(msg: str, k: set) -> str:
+    """Intent classification on a pre-normalized message and its word set (no re-lowering)."""
     if not msg or msg in ("hi", "hello", "hey"):
         return "greeting"
 
-    if any(w in k for w in ("urgent", "emergency", "asap", "reassign", "reassignment")):
-        return "urgent_reassign"
-
-    if any(w in k for w in ("conflict", "conflicts", "double", "overlap", "mismatch", "issue", "problem", "warning")):
-        return "conflicts"
-
-    # Assignment (project-specific) before generic roster
-    if re.search(r"prj\d+", msg) or "project" in k:
-        if any(w in k for w in ("assign", "match", "suggest", "who", "which", "pilot", "drone", "for")):
-            return "assignment"
-
-    if any(w in k for w in ("pilot", "roster", "availability", "available", "leave", "certification", "skill")):
-        return "roster"
-
-    if any(w in k for w in ("drone", "fleet", "inventory", "maintenance", "deploy")):
-        return "fleet"
-
-    if any(w in k for w in ("set", "update", "change", "mark", "status")):
-        return "status_update"
-
-    if any(w in k for w in ("help", "what can", "how")):
-        return "help"
+    candidates = {_INTENT_KEYWORDS[w] for w in k & _INTENT_KEYWORDS.keys()}
+    for intent in _INTENT_PRIORITY:
+        if intent == "assignment":
+            # Assignment (project-specific) before generic roster
+            if (_RE_PRJ_LOWER.search(msg) or "project" in k) and k & _ASSIGNMENT_CUES:
+                return "assignment"
+        elif intent in candidates:
+            return intent
 
     # List/show missions or projects
     if ("mission" in k or "project" in k or "projects" in k) and (len(msg) < 50 or "list" in k or "show" in k or "all" in k):
@@ -70,28 +121,40 @@ def get_intent(user_message: str) -> str:
     return "unknown"
 
 
-def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
+def run_agent(
+    user_message: str, client: Any = None, data: Optional[tuple] = None
+) -> Tuple[str, Optional[dict]]:
     """
     Process user message and return (reply_text, optional_structured_data for UI).
+    Accepts a pre-built Sheets client, and optionally pre-loaded data as a
+    (pilots, drones, missions, assignments) tuple so callers can cache loads.
     Handles load/sync errors gracefully with a clear message.
     """
+    # Lower/tokenize once; every branch below reuses these instead of re-lowering
+    msg_lc = _normalize(user_message)
+    k = set(_RE_WORDS.findall(msg_lc))
+
     try:
-        client = get_sheets_client_cached()
-        pilots = load_pilots(client)
-        drones = load_drones(client)
-        missions = load_missions(client)
-        raw_assignments = load_assignments(client)
-        assignments = list(raw_assignments) if raw_assignments else build_assignments_from_roster_and_missions(
-            pilots, missions
-        )
+        if data is not None:
+            pilots, drones, missions, raw_assignments = data
+        else:
+            if client is None:
+                client = get_sheets_client_cached()
+            pilots, drones, missions, raw_assignments = load_all_sheets(client)
+        missions_by_id = index_by_id(missions, "project_id")
         # Enrich assignments with drone current_assignment from fleet (no duplicates)
-        seen = {(str(x.get("drone_id") or "").strip(), str(x.get("project_id") or "").strip()) for x in assignments if x.get("drone_id")}
+        if raw_assignments:
+            assignments = list(raw_assignments)
+            seen = {(str(x.get("drone_id") or "").strip(), str(x.get("project_id") or "").strip()) for x in assignments if x.get("drone_id")}
+        else:
+            assignments = build_assignments_from_roster_and_missions(pilots, missions, missions_by_id)
+            seen = set()  # derived rows never carry a drone_id
         for d in drones:
             a = (d.get("current_assignment") or "").strip()
-            if a and a not in ("–", "-"):
+            if a not in _EMPTY_ASSIGN:
                 did = (d.get("drone_id") or "").strip()
                 if did and (did, a) not in seen:
-                    proj = next((m for m in missions if (m.get("project_id") or "").strip() == a), None)
+                    proj = missions_by_id.get(a)
                     if proj:
                         assignments.append({
                             "project_id": a,
@@ -101,13 +164,14 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
                             "end_date": proj.get("end_date"),
                         })
                         seen.add((did, a))
+        assignment_index = build_assignment_index(assignments)
     except Exception as e:
         return (
             f"**Could not load data.** Please check your connection and sheet/CSV setup.\n\nError: {e!s}",
             None,
         )
 
-    intent = get_intent(user_message)
+    intent = _get_intent(msg_lc, k)
 
     if intent == "greeting":
         return (
@@ -147,9 +211,9 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
 
     if intent == "confirm_reassign":
         # e.g. "Confirm reassignment PRJ002 to P002 and D003"
-        proj_match = re.search(r"\b(PRJ\d+)\b", user_message, re.I)
-        pilot_match = re.search(r"\b(P\d+)\b", user_message, re.I)
-        drone_match = re.search(r"\b(D\d+)\b", user_message, re.I)
+        proj_match = _RE_PROJ.search(user_message)
+        pilot_match = _RE_PILOT.search(user_message)
+        drone_match = _RE_DRONE.search(user_message)
         project_id = proj_match.group(1).strip() if proj_match else None
         pilot_id = pilot_match.group(1).upper() if pilot_match else None
         drone_id = drone_match.group(1).upper() if drone_match else None
@@ -168,11 +232,14 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
 
     if intent == "urgent_reassign":
         # Extract project id (e.g. PRJ002)
-        proj_match = re.search(r"\b(PRJ\d+)\b", user_message, re.I)
+        proj_match = _RE_PROJ.search(user_message)
         project_id = proj_match.group(1) if proj_match else None
         if not project_id:
             return "Please specify a project ID for urgent reassignment (e.g. *Urgent reassignment for PRJ002*).", None
-        pilot, drone, reasons = urgent_reassign(pilots, drones, missions, assignments, project_id)
+        pilot, drone, reasons = urgent_reassign(
+            pilots, drones, missions, assignments, project_id,
+            missions_by_id=missions_by_id, assignment_index=assignment_index,
+        )
         if not pilot:
             return "Could not find a suitable pilot for urgent reassignment. " + (
                 reasons[0] if reasons else ""
@@ -189,15 +256,18 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
         return "\n".join(lines), {"urgent": {"project_id": project_id, "pilot": pilot, "drone": drone, "reasons": reasons}}
 
     if intent == "assignment":
-        proj_match = re.search(r"\b(PRJ\d+)\b", user_message, re.I)
+        proj_match = _RE_PROJ.search(user_message)
         project_id = proj_match.group(1) if proj_match else None
         if not project_id:
             return "Which project? Please include a project ID (e.g. PRJ001, PRJ002).", None
-        is_urgent = "urgent" in _intent_keywords(user_message) or any(
-            m.get("priority") == "Urgent" and (m.get("project_id") or "").strip() == project_id
-            for m in missions
+        mission = missions_by_id.get(project_id)
+        is_urgent = "urgent" in k or bool(
+            mission and mission.get("priority") == "Urgent"
+        )
+        pilot, drone, reasons = suggest_assignment(
+            pilots, drones, missions, assignments, project_id,
+            is_urgent=is_urgent, missions_by_id=missions_by_id, assignment_index=assignment_index,
         )
-        pilot, drone, reasons = suggest_assignment(pilots, drones, missions, assignments, project_id, is_urgent=is_urgent)
         if not pilot:
             return (reasons[0] if reasons else "No suggestion."), None
         lines = [
@@ -211,29 +281,19 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
         return "\n".join(lines), {"suggestion": {"project_id": project_id, "pilot": pilot, "drone": drone}}
 
     if intent == "roster":
-        # Parse filters from message
-        location = None
-        skill = None
-        cert = None
+        # Parse filters from message (single keyword scan)
+        found = _scan_keywords(msg_lc)
         status = None
-        if "available" in _intent_keywords(user_message):
+        if "available" in k:
             status = "Available"
-        if "leave" in _intent_keywords(user_message):
+        if "leave" in k:
             status = "On Leave"
-        if "assigned" in _intent_keywords(user_message):
+        if "assigned" in k:
             status = "Assigned"
-        for loc in ["Bangalore", "Mumbai", "Delhi", "Chennai"]:
-            if loc.lower() in user_message.lower():
-                location = loc
-                break
-        if "dgca" in user_message.lower():
-            cert = "DGCA"
-        if "night" in user_message.lower():
-            cert = "Night Ops"
-        for s in ["Mapping", "Survey", "Inspection", "Thermal"]:
-            if s.lower() in user_message.lower():
-                skill = s
-                break
+        location = _first(_LOCATIONS, found.get("location", ()))
+        certs = found.get("cert", ())
+        cert = "Night Ops" if "Night Ops" in certs else ("DGCA" if "DGCA" in certs else None)
+        skill = _first(_SKILLS, found.get("skill", ()))
         result = query_pilots(pilots, skill=skill, certification=cert, location=location, status=status)
         if not result:
             return "No pilots match your criteria.", None
@@ -246,18 +306,11 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
         return "\n".join(lines), {"pilots": result}
 
     if intent == "fleet":
-        location = None
-        cap = None
-        status = "Available" if "available" in _intent_keywords(user_message) else None
-        for loc in ["Bangalore", "Mumbai", "Delhi", "Chennai"]:
-            if loc.lower() in user_message.lower():
-                location = loc
-                break
-        for c in ["LiDAR", "RGB", "Thermal"]:
-            if c.lower() in user_message.lower():
-                cap = c
-                break
-        if "maintenance" in user_message.lower():
+        found = _scan_keywords(msg_lc)
+        status = "Available" if "available" in k else None
+        location = _first(_LOCATIONS, found.get("location", ()))
+        cap = _first(_CAPABILITIES, found.get("capability", ()))
+        if "Maintenance" in found.get("status", ()):
             status = "Maintenance"
         result = query_drones(drones, capability=cap, status=status, location=location, exclude_maintenance=False)
         if not result:
@@ -273,13 +326,10 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
 
     if intent == "status_update":
         # e.g. "Set pilot P001 status to On Leave" or "Update drone D002 to Available"
-        pilot_match = re.search(r"\b(P\d+)\b", user_message, re.I)
-        drone_match = re.search(r"\b(D\d+)\b", user_message, re.I)
-        new_status = None
-        for s in ["Available", "On Leave", "Unavailable", "Assigned", "Maintenance"]:
-            if s.lower() in user_message.lower():
-                new_status = s
-                break
+        pilot_match = _RE_PILOT.search(user_message)
+        drone_match = _RE_DRONE.search(user_message)
+        found = _scan_keywords(msg_lc)
+        new_status = _first(_STATUSES, found.get("status", ()))
         if pilot_match and new_status:
             pid = pilot_match.group(1).upper()
             ok, msg = update_pilot_status(pid, new_status)
@@ -310,3 +360,15 @@ def run_agent(user_message: str) -> Tuple[str, Optional[dict]]:
         "**conflicts**, or **urgent reassignments**. Type *help* for examples.",
         None,
     )
+
+
+def run_agent_stream(user_message: str, client: Any = None, data: Optional[tuple] = None):
+    """
+    Yield the agent reply in chunks for st.write_stream-style progressive rendering.
+    The rule-based agent computes the full reply up front, so this streams
+    line-by-line; a token-streaming LLM backend can slot in here without
+    changing callers.
+    """
+    reply, _ = run_agent(user_message, client=client, data=data)
+    for line in reply.splitlines(keepends=True):
+        yield line
@@ -2,36 +2,99 @@
 Assignment coordination: match pilots/drones to projects, track and reassign.
 Handles urgent reassignments with priority override and least-impact selection.
 """
+from collections import defaultdict
+from functools import lru_cache
 from typing import List, Optional, Tuple
 from datetime import datetime
 
-from src.roster import get_pilot_by_id, query_pilots
+from src.roster import _EMPTY_ASSIGN, get_pilot_by_id, query_pilots
 from src.fleet import get_drone_by_id, query_drones
 
 
+@lru_cache(maxsize=2048)
 def _parse_date(s: Optional[str]):
-    """Parse date string; supports YYYY-MM-DD and DD/MM/YYYY. Returns None on failure."""
+    """Parse date string; supports YYYY-MM-DD and DD/MM/YYYY. Returns None on failure. Memoized."""
     if not s:
         return None
-    s = (s or "").strip()[:10]
+    s = s.strip()[:10]
+    # Probe the separator instead of try/except-ing through strptime formats:
+    # the common zero-padded ISO path builds the datetime from integer slices.
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        try:
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+        except ValueError:
+            return None
+    # Slash dates (DD/MM vs MM/DD is ambiguous) and unpadded forms still go
+    # through strptime, in the same order as before
     for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y"):
         try:
             return datetime.strptime(s, fmt)
-        except Exception:
+        except ValueError:
             continue
     return None
 
 
-def _cap_match(drone_capabilities: str, required: str) -> bool:
-    """True if required capability appears in drone's comma-separated capabilities (case-insensitive)."""
-    if not required or not drone_capabilities:
-        return False
-    parts = [p.strip().lower() for p in str(drone_capabilities).split(",")]
-    return required.strip().lower() in parts
+def _gs(d: dict, k: str) -> str:
+    """Stripped string value of d[k] ('' when missing or None); hot-path shorthand."""
+    v = d.get(k)
+    if v is None:
+        return ""
+    return v.strip() if isinstance(v, str) else str(v).strip()
+
+
+def _tokens(cell) -> frozenset:
+    """Comma-separated cell -> lowered token set."""
+    return frozenset(t.strip().lower() for t in str(cell or "").split(",") if t.strip())
+
+
+def _cached_tokens(d: dict, field: str) -> frozenset:
+    """Token set for a comma-separated field, lazily cached on the row dict."""
+    key = "_" + field + "_set"
+    v = d.get(key)
+    if v is None:
+        v = _tokens(d.get(field))
+        d[key] = v
+    return v
+
+
+def _filter_pilots_for_mission(pilots: List[dict], loc: str, skills: str, certs: str) -> List[dict]:
+    """
+    One-pass roster filter: location equality plus all required skill/cert
+    tokens, instead of one query_pilots re-scan per token.
+    """
+    loc_lc = loc.strip().lower()
+    need_skills = _tokens(skills)
+    need_certs = _tokens(certs)
+    out = []
+    for p in pilots:
+        if loc_lc and _gs(p, "location").lower() != loc_lc:
+            continue
+        if need_skills and not _cached_tokens(p, "skills") >= need_skills:
+            continue
+        if need_certs and not _cached_tokens(p, "certifications") >= need_certs:
+            continue
+        out.append(p)
+    return out
 
 
+def _is_iso(s: str) -> bool:
+    """Cheap check for a YYYY-MM-DD prefix (lexical order == chronological order)."""
+    return (
+        len(s) >= 10
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdigit()
+        and s[5:7].isdigit()
+        and s[8:10].isdigit()
+    )
+
+
+@lru_cache(maxsize=8192)
 def _dates_overlap(s1: str, e1: str, s2: str, e2: str) -> bool:
-    """True if [s1,e1] overlaps [s2,e2]."""
+    """True if [s1,e1] overlaps [s2,e2]. Memoized: the conflict scan re-checks the same date pairs."""
+    if _is_iso(s1) and _is_iso(e1) and _is_iso(s2) and _is_iso(e2):
+        # ISO dates compare correctly as strings; skip strptime entirely
+        return not (e1[:10] < s2[:10] or e2[:10] < s1[:10])
     a, b = _parse_date(s1), _parse_date(e1)
     c, d = _parse_date(s2), _parse_date(e2)
     if not all([a, b, c, d]):
@@ -40,81 +103,172 @@ def _dates_overlap(s1: str, e1: str, s2: str, e2: str) -> bool:
 
 
 def build_assignments_from_roster_and_missions(
-    pilots: List[dict], missions: List[dict]
+    pilots: List[dict], missions: List[dict], missions_by_id: Optional[dict] = None
 ) -> List[dict]:
     """
     Build assignment list from pilot current_assignment and mission dates.
     Each item: project_id, pilot_id, start_date, end_date (drone optional).
+    Pass missions_by_id (from index_by_id) to reuse an existing lookup.
     """
+    if missions_by_id is None:
+        missions_by_id = index_by_id(missions, "project_id")
     assignments = []
     for p in pilots:
-        proj = (p.get("current_assignment") or "").strip()
-        if not proj or proj in ("–", "-"):
+        proj = _gs(p, "current_assignment")
+        if proj in _EMPTY_ASSIGN:
             continue
-        for m in missions:
-            if (m.get("project_id") or "").strip() == proj:
-                assignments.append({
-                    "project_id": proj,
-                    "pilot_id": p.get("pilot_id"),
-                    "drone_id": None,
-                    "start_date": m.get("start_date"),
-                    "end_date": m.get("end_date"),
-                })
-                break
+        m = missions_by_id.get(proj)
+        if m is not None:
+            assignments.append({
+                "project_id": proj,
+                "pilot_id": p.get("pilot_id"),
+                "drone_id": None,
+                "start_date": m.get("start_date"),
+                "end_date": m.get("end_date"),
+            })
     return assignments
 
 
+def index_by_id(rows: List[dict], id_key: str) -> dict:
+    """Map stripped id -> row for O(1) lookups (e.g. index_by_id(missions, "project_id"))."""
+    return {_gs(r, id_key): r for r in rows if r.get(id_key)}
+
+
+def build_assignment_index(assignments: List[dict]) -> dict:
+    """
+    Group assignments by pilot_id and drone_id so busy checks touch only the
+    rows for one resource instead of scanning the whole list per candidate.
+    """
+    idx = {"by_pilot": defaultdict(list), "by_drone": defaultdict(list)}
+    for a in assignments:
+        pid = _gs(a, "pilot_id")
+        if pid:
+            idx["by_pilot"][pid].append(a)
+        did = _gs(a, "drone_id")
+        if did:
+            idx["by_drone"][did].append(a)
+    return idx
+
+
+def _find_mission(missions: List[dict], project_id: str, missions_by_id: Optional[dict]) -> Optional[dict]:
+    """Look up a mission by project id, via the prebuilt index when available."""
+    if missions_by_id is not None:
+        return missions_by_id.get(project_id)
+    return next((m for m in missions if _gs(m, "project_id") == project_id), None)
+
+
+def build_pilot_index(pilots: List[dict]) -> dict:
+    """
+    Inverted indexes over the roster: location / skill token / cert token -> pilot row indexes.
+    Build once per loaded roster and pass into the match/suggest helpers when
+    looping over many missions, so per-mission filtering becomes set intersection.
+    """
+    idx = {"by_loc": defaultdict(set), "by_skill": defaultdict(set), "by_cert": defaultdict(set)}
+    for i, p in enumerate(pilots):
+        loc = _gs(p, "location").lower()
+        if loc:
+            idx["by_loc"][loc].add(i)
+        for s in str(p.get("skills") or "").split(","):
+            s = s.strip().lower()
+            if s:
+                idx["by_skill"][s].add(i)
+        for c in str(p.get("certifications") or "").split(","):
+            c = c.strip().lower()
+            if c:
+                idx["by_cert"][c].add(i)
+    return idx
+
+
+def build_drone_index(drones: List[dict]) -> dict:
+    """Inverted indexes over the fleet: location / capability token -> drone row indexes."""
+    idx = {"by_loc": defaultdict(set), "by_cap": defaultdict(set)}
+    for i, d in enumerate(drones):
+        loc = _gs(d, "location").lower()
+        if loc:
+            idx["by_loc"][loc].add(i)
+        for c in str(d.get("capabilities") or "").split(","):
+            c = c.strip().lower()
+            if c:
+                idx["by_cap"][c].add(i)
+    return idx
+
+
+def _pilot_candidates_from_index(
+    pilots: List[dict], pilot_index: dict, loc: str, skills: str, certs: str
+) -> List[dict]:
+    """Select pilots via set intersection of the inverted indexes (AND over all filters)."""
+    selected: Optional[set] = None
+    if loc:
+        selected = set(pilot_index["by_loc"].get(loc.lower(), ()))
+    for skill in [s.strip().lower() for s in skills.split(",") if s.strip()]:
+        hits = pilot_index["by_skill"].get(skill, set())
+        selected = set(hits) if selected is None else selected & hits
+    for cert in [c.strip().lower() for c in certs.split(",") if c.strip()]:
+        hits = pilot_index["by_cert"].get(cert, set())
+        selected = set(hits) if selected is None else selected & hits
+    if selected is None:
+        return list(pilots)
+    return [pilots[i] for i in sorted(selected)]
+
+
 def match_pilots_to_mission(
     pilots: List[dict],
     mission: dict,
     assignments: List[dict],
     exclude_pilot_ids: Optional[List[str]] = None,
+    pilot_index: Optional[dict] = None,
+    assignment_index: Optional[dict] = None,
 ) -> List[dict]:
     """
     Return pilots that can do this mission: same location, required skills/certs,
     available in date range, not double-booked.
+    Pass pilot_index (from build_pilot_index) to skip the linear roster scans,
+    and assignment_index (from build_assignment_index) for O(1) busy checks.
     """
-    loc = (mission.get("location") or "").strip()
-    skills = (mission.get("required_skills") or "").strip()
-    certs = (mission.get("required_certs") or "").strip()
+    loc = _gs(mission, "location")
+    skills = _gs(mission, "required_skills")
+    certs = _gs(mission, "required_certs")
     start, end = mission.get("start_date"), mission.get("end_date")
-    project_id = (mission.get("project_id") or "").strip()
+    project_id = _gs(mission, "project_id")
 
     exclude = set(exclude_pilot_ids or [])
 
-    # Filter by location, then by skill/cert
-    candidates = query_pilots(pilots, location=loc if loc else None)
-    if skills:
-        for skill in [s.strip() for s in skills.split(",") if s.strip()]:
-            candidates = query_pilots(candidates, skill=skill)
-    if certs:
-        for cert in [c.strip() for c in certs.split(",") if c.strip()]:
-            candidates = query_pilots(candidates, certification=cert)
+    if pilot_index is not None:
+        candidates = _pilot_candidates_from_index(pilots, pilot_index, loc, skills, certs)
+    else:
+        candidates = _filter_pilots_for_mission(pilots, loc, skills, certs)
 
     # Must be Available or we allow override for urgent
-    available_only = [p for p in candidates if (p.get("status") or "").strip().lower() == "available"]
+    available_only = [p for p in candidates if _gs(p, "status").lower() == "available"]
     if not available_only:
-        available_only = [p for p in candidates if (p.get("status") or "").strip().lower() in ("available", "assigned")]
+        available_only = [p for p in candidates if _gs(p, "status").lower() in ("available", "assigned")]
 
     out = []
     for p in available_only:
-        pid = (p.get("pilot_id") or "").strip()
+        pid = _gs(p, "pilot_id")
         if pid in exclude:
             continue
         # Check overlap with existing assignments
-        if _pilot_busy(pid, start, end, assignments, exclude_project=project_id):
+        if _pilot_busy(pid, start, end, assignments, exclude_project=project_id, assignment_index=assignment_index):
             continue
         out.append(p)
     return out
 
 
 def _pilot_busy(
-    pilot_id: str, start: str, end: str, assignments: List[dict], exclude_project: Optional[str] = None
+    pilot_id: str,
+    start: str,
+    end: str,
+    assignments: List[dict],
+    exclude_project: Optional[str] = None,
+    assignment_index: Optional[dict] = None,
 ) -> bool:
-    for a in assignments:
-        if (a.get("pilot_id") or "").strip() != pilot_id:
-            continue
-        if exclude_project and (a.get("project_id") or "").strip() == exclude_project:
+    if assignment_index is not None:
+        rows = assignment_index["by_pilot"].get(pilot_id, ())
+    else:
+        rows = [a for a in assignments if _gs(a, "pilot_id") == pilot_id]
+    for a in rows:
+        if exclude_project and _gs(a, "project_id") == exclude_project:
             continue
         if _dates_overlap(
             a.get("start_date") or "",
@@ -131,57 +285,65 @@ def match_drones_to_mission(
     mission: dict,
     assignments: List[dict],
     exclude_drone_ids: Optional[List[str]] = None,
+    drone_index: Optional[dict] = None,
+    assignment_index: Optional[dict] = None,
 ) -> List[dict]:
     """
     Return drones that can support this mission: same location, capability match,
     not in maintenance, not double-booked.
+    Pass drone_index (from build_drone_index) to narrow by location without a full scan.
     """
-    loc = (mission.get("location") or "").strip()
+    loc = _gs(mission, "location")
+    pool = drones
+    if drone_index is not None and loc:
+        pool = [drones[i] for i in sorted(drone_index["by_loc"].get(loc.lower(), ()))]
     # Mission may not list required capability; use required_skills as proxy (e.g. Thermal -> Thermal drone)
-    cap = (mission.get("required_skills") or "").strip()
+    cap = _gs(mission, "required_skills")
     start, end = mission.get("start_date"), mission.get("end_date")
-    project_id = (mission.get("project_id") or "").strip()
+    project_id = _gs(mission, "project_id")
 
     exclude = set(exclude_drone_ids or [])
 
     candidates = query_drones(
-        drones,
+        pool,
         location=loc if loc else None,
         status="Available",
         exclude_maintenance=True,
     )
     # Match capability: mission required_skills may be comma-separated; drone must have at least one
     if cap:
-        caps = [c.strip() for c in cap.split(",") if c.strip()]
-        if caps:
-            matched = []
-            for d in candidates:
-                drone_caps = (d.get("capabilities") or "").strip()
-                if any(c and _cap_match(drone_caps, c) for c in caps):
-                    matched.append(d)
+        need_caps = _tokens(cap)
+        if need_caps:
+            matched = [d for d in candidates if need_caps & _cached_tokens(d, "capabilities")]
             candidates = matched if matched else candidates
     if not candidates:
-        candidates = query_drones(drones, location=loc if loc else None, exclude_maintenance=False)
+        candidates = query_drones(pool, location=loc if loc else None, exclude_maintenance=False)
 
     out = []
     for d in candidates:
-        did = (d.get("drone_id") or "").strip()
+        did = _gs(d, "drone_id")
         if did in exclude:
             continue
-        if _drone_busy(did, start, end, assignments, exclude_project=project_id):
+        if _drone_busy(did, start, end, assignments, exclude_project=project_id, assignment_index=assignment_index):
             continue
         out.append(d)
     return out
 
 
 def _drone_busy(
-    drone_id: str, start: str, end: str, assignments: List[dict], exclude_project: Optional[str] = None
+    drone_id: str,
+    start: str,
+    end: str,
+    assignments: List[dict],
+    exclude_project: Optional[str] = None,
+    assignment_index: Optional[dict] = None,
 ) -> bool:
-    for a in assignments:
-        did = (a.get("drone_id") or "").strip()
-        if not did or did != drone_id:
-            continue
-        if exclude_project and (a.get("project_id") or "").strip() == exclude_project:
+    if assignment_index is not None:
+        rows = assignment_index["by_drone"].get(drone_id, ())
+    else:
+        rows = [a for a in assignments if _gs(a, "drone_id") == drone_id]
+    for a in rows:
+        if exclude_project and _gs(a, "project_id") == exclude_project:
             continue
         if _dates_overlap(
             a.get("start_date") or "",
@@ -200,41 +362,47 @@ def suggest_assignment(
     assignments: List[dict],
     project_id: str,
     is_urgent: bool = False,
+    pilot_index: Optional[dict] = None,
+    drone_index: Optional[dict] = None,
+    missions_by_id: Optional[dict] = None,
+    assignment_index: Optional[dict] = None,
 ) -> Tuple[Optional[dict], Optional[dict], List[str]]:
     """
     Suggest best pilot and drone for project_id. Returns (pilot, drone, reasons).
     For urgent: allow reassignment (least-impact); reasons explain overrides.
+    Callers looping over missions should pass the prebuilt indexes.
     """
     reasons = []
-    mission = next((m for m in missions if (m.get("project_id") or "").strip() == project_id), None)
+    mission = _find_mission(missions, project_id, missions_by_id)
     if not mission:
         return None, None, ["Project not found."]
 
-    pilot_candidates = match_pilots_to_mission(pilots, mission, assignments)
-    drone_candidates = match_drones_to_mission(drones, mission, assignments)
+    pilot_candidates = match_pilots_to_mission(
+        pilots, mission, assignments, pilot_index=pilot_index, assignment_index=assignment_index
+    )
 
     if not pilot_candidates and is_urgent:
         # Urgent: consider currently assigned pilots and suggest least-impact reassignment
-        all_at_location = query_pilots(pilots, location=(mission.get("location") or "").strip())
-        for p in all_at_location:
-            if p not in pilot_candidates:
-                pilot_candidates.append(p)
+        pilot_candidates = query_pilots(pilots, location=_gs(mission, "location"))
         reasons.append("Urgent: expanded to assigned pilots for possible reassignment.")
 
     if not pilot_candidates:
+        # Early exit: no point matching drones when there is no pilot to fly one
         return None, None, ["No suitable pilot found for this project."]
 
     # Prefer available over assigned
-    pilot = None
-    for p in pilot_candidates:
-        if (p.get("status") or "").strip().lower() == "available":
-            pilot = p
-            break
+    pilot = next(
+        (p for p in pilot_candidates if _gs(p, "status").lower() == "available"),
+        None,
+    )
     if not pilot:
         pilot = pilot_candidates[0]
-        if (pilot.get("status") or "").strip().lower() == "assigned":
+        if _gs(pilot, "status").lower() == "assigned":
             reasons.append(f"Pilot {pilot.get('name')} is currently assigned; urgent reassignment may be needed.")
 
+    drone_candidates = match_drones_to_mission(
+        drones, mission, assignments, drone_index=drone_index, assignment_index=assignment_index
+    )
     drone = drone_candidates[0] if drone_candidates else None
     if not drone:
         reasons.append("No suitable drone available at location; check maintenance or assign manually.")
@@ -248,59 +416,57 @@ def urgent_reassign(
     missions: List[dict],
     assignments: List[dict],
     project_id: str,
+    missions_by_id: Optional[dict] = None,
+    assignment_index: Optional[dict] = None,
 ) -> Tuple[Optional[dict], Optional[dict], List[str]]:
     """
     Urgent reassignment: pick best pilot/drone even if it requires unassigning from another project.
     Returns (pilot, drone, list of conflict explanations).
     """
-    mission = next((m for m in missions if (m.get("project_id") or "").strip() == project_id), None)
+    mission = _find_mission(missions, project_id, missions_by_id)
     if not mission:
         return None, None, ["Project not found."]
 
     reasons = []
     # Get all pilots at location with skills/certs (allow assigned)
-    loc = (mission.get("location") or "").strip()
-    skills = (mission.get("required_skills") or "").strip()
-    certs = (mission.get("required_certs") or "").strip()
+    loc = _gs(mission, "location")
+    skills = _gs(mission, "required_skills")
+    certs = _gs(mission, "required_certs")
     start, end = mission.get("start_date"), mission.get("end_date")
 
-    candidates = query_pilots(pilots, location=loc if loc else None)
-    if skills:
-        for skill in [s.strip() for s in skills.split(",") if s.strip()]:
-            candidates = query_pilots(candidates, skill=skill)
-    if certs:
-        for cert in [c.strip() for c in certs.split(",") if c.strip()]:
-            candidates = query_pilots(candidates, certification=cert)
-
-    # Sort: Available first, then by current assignment (least impact = assigned to project ending soonest)
-    available = [p for p in candidates if (p.get("status") or "").strip().lower() == "available"]
-    assigned = [p for p in candidates if p not in available]
-
-    def impact_key(p):
-        """Lower = less impact to reassign."""
-        pid = (p.get("pilot_id") or "").strip()
-        for a in assignments:
-            if (a.get("pilot_id") or "").strip() != pid:
-                continue
-            ed = _parse_date(a.get("end_date"))
-            return (ed or datetime.max).strftime("%Y-%m-%d")
-        return "9999-99-99"
-
-    assigned.sort(key=impact_key)
-    pilot_order = available + assigned
-    pilot = pilot_order[0] if pilot_order else None
-
-    if pilot and (pilot.get("status") or "").strip().lower() == "assigned":
+    candidates = _filter_pilots_for_mission(pilots, loc, skills, certs)
+
+    # Available first; the impact sort only matters when nobody is free
+    available = [p for p in candidates if _gs(p, "status").lower() == "available"]
+    if available:
+        pilot = available[0]
+    else:
+        def impact_key(p):
+            """Lower = less impact to reassign (soonest end of the pilot's assignments)."""
+            pid = _gs(p, "pilot_id")
+            if assignment_index is not None:
+                rows = assignment_index["by_pilot"].get(pid, ())
+            else:
+                rows = [a for a in assignments if _gs(a, "pilot_id") == pid]
+            if not rows:
+                return datetime.max
+            return min((_parse_date(a.get("end_date")) or datetime.max) for a in rows)
+
+        # Least impact = currently assigned to the project ending soonest
+        candidates.sort(key=impact_key)
+        pilot = candidates[0] if candidates else None
+
+    if pilot and _gs(pilot, "status").lower() == "assigned":
         cur = pilot.get("current_assignment") or ""
         reasons.append(f"Urgent override: {pilot.get('name')} will be reassigned from {cur} to {project_id}.")
 
     # Drone: prefer Available, same location
-    drone_candidates = match_drones_to_mission(drones, mission, assignments)
+    drone_candidates = match_drones_to_mission(drones, mission, assignments, assignment_index=assignment_index)
     drone = drone_candidates[0] if drone_candidates else None
     if not drone:
         drone_candidates = query_drones(drones, location=loc, exclude_maintenance=False)
         drone = drone_candidates[0] if drone_candidates else None
-        if drone and (drone.get("status") or "").strip().lower() == "maintenance":
+        if drone and _gs(drone, "status").lower() == "maintenance":
             reasons.append(f"Warning: drone {drone.get('drone_id')} is in maintenance; verify before use.")
 
     return pilot, drone, reasons
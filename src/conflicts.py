@@ -1,17 +1,17 @@
 """
 Conflict detection: double-booking, skill/cert mismatch, equipment-pilot location, drone maintenance.
 """
+from collections import defaultdict
 from typing import List, Optional, Tuple
 from datetime import datetime
 
-from src.roster import get_pilot_by_id
-from src.fleet import get_drone_by_id
-from src.assignments_engine import _parse_date, _dates_overlap, build_assignments_from_roster_and_missions
-
-
-def _has_token(cell: str, token: str) -> bool:
-    parts = [s.strip().lower() for s in (cell or "").split(",")]
-    return token.strip().lower() in parts
+from src.assignments_engine import (
+    _cached_tokens,
+    _parse_date,
+    build_assignments_from_roster_and_missions,
+    index_by_id,
+)
+from src.roster import _EMPTY_ASSIGN
 
 
 def detect_all_conflicts(
@@ -24,8 +24,14 @@ def detect_all_conflicts(
     Run all conflict checks. Return list of conflict dicts:
     { type, severity, message, pilot_id?, drone_id?, project_id? }
     """
+    # One-shot id -> row indexes; the per-assignment helpers below do hash
+    # lookups instead of linear scans over pilots/drones/missions
+    pilots_by_id = index_by_id(pilots, "pilot_id")
+    drones_by_id = index_by_id(drones, "drone_id")
+    missions_by_id = index_by_id(missions, "project_id")
+
     if assignments is None:
-        assignments = build_assignments_from_roster_and_missions(pilots, missions)
+        assignments = build_assignments_from_roster_and_missions(pilots, missions, missions_by_id)
     assignments = list(assignments)
 
     # Merge drone assignments from fleet current_assignment (no duplicates)
@@ -36,8 +42,8 @@ def detect_all_conflicts(
             seen_drone_proj.add((str(did).strip(), str(pid).strip()))
     for d in drones:
         a = (d.get("current_assignment") or "").strip()
-        if a and a not in ("–", "-"):
-            proj = next((m for m in missions if (m.get("project_id") or "").strip() == a), None)
+        if a not in _EMPTY_ASSIGN:
+            proj = missions_by_id.get(a)
             if proj:
                 did = (d.get("drone_id") or "").strip()
                 proj_id = (proj.get("project_id") or a or "").strip()
@@ -51,81 +57,94 @@ def detect_all_conflicts(
                     })
                     seen_drone_proj.add((did, proj_id))
 
+    # Cache normalized ids and ordinal-day dates on each row: stripped/parsed
+    # once here, the checks below read plain strings and compare plain ints
+    for a in assignments:
+        if "_s" not in a:
+            a["_pilot_id"] = str(a.get("pilot_id") or "").strip()
+            a["_drone_id"] = str(a.get("drone_id") or "").strip()
+            a["_project_id"] = str(a.get("project_id") or "").strip()
+            s = _parse_date(a.get("start_date") or "")
+            e = _parse_date(a.get("end_date") or "")
+            a["_s"] = s.toordinal() if s else None
+            a["_e"] = e.toordinal() if e else None
+
     out = []
     out.extend(_double_booking_pilot(assignments))
     out.extend(_double_booking_drone(assignments))
-    out.extend(_skill_cert_mismatch(pilots, missions, assignments))
+    out.extend(_skill_cert_mismatch(pilots_by_id, missions_by_id, assignments))
     out.extend(_drone_maintenance_assigned(drones, assignments))
-    out.extend(_pilot_drone_location_mismatch(pilots, drones, missions, assignments))
+    out.extend(_pilot_drone_location_mismatch(pilots_by_id, drones_by_id, missions_by_id, assignments))
     return out
 
 
-def _double_booking_pilot(assignments: List[dict]) -> List[dict]:
-    """Pilot assigned to overlapping project dates."""
+def _double_booking(assignments: List[dict], id_key: str, conflict_type: str, label: str) -> List[dict]:
+    """
+    Sweep-line overlapping-assignment scan for one resource column
+    (pilot_id or drone_id): bucket by id, sort each bucket by start date,
+    and compare each interval only against the still-active ones instead
+    of every pair. Output-sensitive O(N log N + overlaps).
+    """
+    buckets = defaultdict(list)
+    for i, a in enumerate(assignments):
+        rid = a["_" + id_key]
+        if not rid:
+            continue
+        s, e = a.get("_s"), a.get("_e")
+        if s is None or e is None:
+            continue
+        buckets[rid].append((s, e, i, a.get("project_id")))
+
     conflicts = []
-    pilot_assignments = [a for a in assignments if a.get("pilot_id")]
-    for i, a1 in enumerate(pilot_assignments):
-        for a2 in pilot_assignments[i + 1 :]:
-            if (a1.get("pilot_id") or "").strip() != (a2.get("pilot_id") or "").strip():
-                continue
-            if _dates_overlap(
-                a1.get("start_date") or "",
-                a1.get("end_date") or "",
-                a2.get("start_date") or "",
-                a2.get("end_date") or "",
-            ):
+    for rid, rows in buckets.items():
+        if len(rows) < 2:
+            continue
+        rows.sort(key=lambda t: t[0])
+        active = []  # (end, original_index, project_id) of intervals still open
+        for s, e, i, proj in rows:
+            active = [t for t in active if t[0] >= s]
+            for _e2, i2, proj2 in active:
+                # Keep original list order in the message, matching the pair scan
+                first, second = (proj2, proj) if i2 < i else (proj, proj2)
                 conflicts.append({
-                    "type": "double_booking_pilot",
+                    "type": conflict_type,
                     "severity": "high",
-                    "message": f"Pilot {a1.get('pilot_id')} has overlapping assignments: {a1.get('project_id')} and {a2.get('project_id')}.",
-                    "pilot_id": a1.get("pilot_id"),
-                    "project_id": a2.get("project_id"),
+                    "message": f"{label} {rid} has overlapping assignments: {first} and {second}.",
+                    id_key: rid,
+                    "project_id": second,
                 })
+            active.append((e, i, proj))
     return conflicts
 
 
+def _double_booking_pilot(assignments: List[dict]) -> List[dict]:
+    """Pilot assigned to overlapping project dates."""
+    return _double_booking(assignments, "pilot_id", "double_booking_pilot", "Pilot")
+
+
 def _double_booking_drone(assignments: List[dict]) -> List[dict]:
     """Drone assigned to overlapping project dates."""
-    conflicts = []
-    drone_assignments = [a for a in assignments if a.get("drone_id")]
-    for i, a1 in enumerate(drone_assignments):
-        for a2 in drone_assignments[i + 1 :]:
-            if (a1.get("drone_id") or "").strip() != (a2.get("drone_id") or "").strip():
-                continue
-            if _dates_overlap(
-                a1.get("start_date") or "",
-                a1.get("end_date") or "",
-                a2.get("start_date") or "",
-                a2.get("end_date") or "",
-            ):
-                conflicts.append({
-                    "type": "double_booking_drone",
-                    "severity": "high",
-                    "message": f"Drone {a1.get('drone_id')} has overlapping assignments: {a1.get('project_id')} and {a2.get('project_id')}.",
-                    "drone_id": a1.get("drone_id"),
-                    "project_id": a2.get("project_id"),
-                })
-    return conflicts
+    return _double_booking(assignments, "drone_id", "double_booking_drone", "Drone")
 
 
-def _skill_cert_mismatch(pilots: List[dict], missions: List[dict], assignments: List[dict]) -> List[dict]:
+def _skill_cert_mismatch(pilots_by_id: dict, missions_by_id: dict, assignments: List[dict]) -> List[dict]:
     """Pilot assigned to job requiring certification/skill they lack."""
     conflicts = []
     for a in assignments:
-        pid = (a.get("pilot_id") or "").strip()
+        pid = a["_pilot_id"]
         if not pid:
             continue
-        proj_id = (a.get("project_id") or "").strip()
-        mission = next((m for m in missions if (m.get("project_id") or "").strip() == proj_id), None)
+        proj_id = a["_project_id"]
+        mission = missions_by_id.get(proj_id)
         if not mission:
             continue
-        pilot = get_pilot_by_id(pilots, pid)
+        pilot = pilots_by_id.get(pid)
         if not pilot:
             continue
         req_skills = (mission.get("required_skills") or "").strip()
         req_certs = (mission.get("required_certs") or "").strip()
         for skill in [s.strip() for s in req_skills.split(",") if s.strip()]:
-            if not _has_token(pilot.get("skills", ""), skill):
+            if skill.lower() not in _cached_tokens(pilot, "skills"):
                 conflicts.append({
                     "type": "skill_mismatch",
                     "severity": "high",
@@ -134,7 +153,7 @@ def _skill_cert_mismatch(pilots: List[dict], missions: List[dict], assignments:
                     "project_id": proj_id,
                 })
         for cert in [c.strip() for c in req_certs.split(",") if c.strip()]:
-            if not _has_token(pilot.get("certifications", ""), cert):
+            if cert.lower() not in _cached_tokens(pilot, "certifications"):
                 conflicts.append({
                     "type": "certification_mismatch",
                     "severity": "high",
@@ -153,7 +172,7 @@ def _drone_maintenance_assigned(drones: List[dict], assignments: List[dict]) ->
             continue
         did = (d.get("drone_id") or "").strip()
         for a in assignments:
-            if (a.get("drone_id") or "").strip() != did:
+            if a["_drone_id"] != did:
                 continue
             conflicts.append({
                 "type": "drone_maintenance_assigned",
@@ -166,25 +185,25 @@ def _drone_maintenance_assigned(drones: List[dict], assignments: List[dict]) ->
 
 
 def _pilot_drone_location_mismatch(
-    pilots: List[dict],
-    drones: List[dict],
-    missions: List[dict],
+    pilots_by_id: dict,
+    drones_by_id: dict,
+    missions_by_id: dict,
     assignments: List[dict],
 ) -> List[dict]:
     """Pilot and assigned drone in different locations than project."""
     conflicts = []
     for a in assignments:
-        proj_id = (a.get("project_id") or "").strip()
-        mission = next((m for m in missions if (m.get("project_id") or "").strip() == proj_id), None)
+        proj_id = a["_project_id"]
+        mission = missions_by_id.get(proj_id)
         if not mission:
             continue
         loc = (mission.get("location") or "").strip().lower()
         if not loc:
             continue
-        pid = (a.get("pilot_id") or "").strip()
-        did = (a.get("drone_id") or "").strip()
+        pid = a["_pilot_id"]
+        did = a["_drone_id"]
         if pid:
-            pilot = get_pilot_by_id(pilots, pid)
+            pilot = pilots_by_id.get(pid)
             if pilot and (pilot.get("location") or "").strip().lower() != loc:
                 conflicts.append({
                     "type": "pilot_location_mismatch",
@@ -194,7 +213,7 @@ def _pilot_drone_location_mismatch(
                     "project_id": proj_id,
                 })
         if did:
-            drone = get_drone_by_id(drones, did)
+            drone = drones_by_id.get(did)
             if drone and (drone.get("location") or "").strip().lower() != loc:
                 conflicts.append({
                     "type": "drone_location_mismatch",
@@ -2,7 +2,10 @@
 Unified data loader: Google Sheets or local CSV fallback.
 Provides pilots, drones, missions, assignments to the rest of the app.
 """
+import functools
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -12,6 +15,7 @@ import config
 from src.sheets_client import (
     get_sheets_client,
     read_sheet_as_dicts,
+    read_sheets_batch,
 )
 
 # Base path for CSV fallback (project root)
@@ -22,6 +26,61 @@ def _csv_path(name: str) -> str:
     return str(BASE_DIR / f"{name}.csv")
 
 
+@functools.lru_cache(maxsize=16)
+def _read_csv_cached(path: str, mtime: float) -> tuple:
+    # C parser + str dtype: no type inference pass, and every column takes the
+    # same vectorized strip (ids/dates stay strings, matching the Sheets path).
+    # keep_default_na=False leaves empty cells as "" so no NA-replace pass is
+    # needed (downstream code treats "" and None alike).
+    df = pd.read_csv(path, dtype=str, engine="c", keep_default_na=False)
+    for col in df.columns:
+        df[col] = df[col].str.strip()
+    return tuple(df.to_dict("records"))
+
+
+def _read_csv_records(name: str) -> List[dict]:
+    """
+    Read a fallback CSV as a list of dicts. Parses are cached per
+    (path, mtime), so unchanged files are only read once per process.
+    """
+    path = _csv_path(name)
+    if not os.path.exists(path):
+        return []
+    return list(_read_csv_cached(path, os.path.getmtime(path)))
+
+
+# Short-lived cache so back-to-back chat turns reuse one fetch instead of
+# re-hitting the Sheets API (or re-parsing CSVs). Writes in src.sync call
+# invalidate_cache() so mutations are never read stale.
+_CACHE_TTL_SECONDS = 30.0
+_CACHE: dict = {}
+
+
+def _cached(key, fn):
+    now = time.monotonic()
+    ts, v = _CACHE.get(key, (0.0, None))
+    if now - ts < _CACHE_TTL_SECONDS:
+        return v
+    v = fn()
+    _CACHE[key] = (now, v)
+    return v
+
+
+def invalidate_cache() -> None:
+    """Drop all cached sheet data; called after any successful write."""
+    _CACHE.clear()
+
+
+def _ttl_cached(name: str):
+    """Wrap a loader so its result is cached for _CACHE_TTL_SECONDS (keyed on client presence)."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(client: Any = None):
+            return _cached((name, client is not None), lambda: fn(client))
+        return wrapper
+    return deco
+
+
 def _sheet_name_pilots() -> Optional[str]:
     """Worksheet name for pilots; use whenever configured, not only for single workbook."""
     s = (config.SHEET_NAME_PILOTS or "").strip()
@@ -43,6 +102,7 @@ def _sheet_name_assignments() -> Optional[str]:
     return s if s else None
 
 
+@_ttl_cached("pilots")
 def load_pilots(client: Any = None) -> List[dict]:
     """Load pilot roster from Sheets or CSV."""
     if not config.USE_LOCAL_CSV and client:
@@ -51,13 +111,10 @@ def load_pilots(client: Any = None) -> List[dict]:
             data = read_sheet_as_dicts(client, sheet_id, _sheet_name_pilots())
             if data:
                 return data
-    path = _csv_path("pilot_roster")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        return df.replace({pd.NA: None}).to_dict("records")
-    return []
+    return _read_csv_records("pilot_roster")
 
 
+@_ttl_cached("drones")
 def load_drones(client: Any = None) -> List[dict]:
     """Load drone fleet from Sheets or CSV."""
     if not config.USE_LOCAL_CSV and client:
@@ -66,13 +123,10 @@ def load_drones(client: Any = None) -> List[dict]:
             data = read_sheet_as_dicts(client, sheet_id, _sheet_name_drones())
             if data:
                 return data
-    path = _csv_path("drone_fleet")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        return df.replace({pd.NA: None}).to_dict("records")
-    return []
+    return _read_csv_records("drone_fleet")
 
 
+@_ttl_cached("missions")
 def load_missions(client: Any = None) -> List[dict]:
     """Load missions/projects from Sheets or CSV."""
     if not config.USE_LOCAL_CSV and client:
@@ -81,13 +135,10 @@ def load_missions(client: Any = None) -> List[dict]:
             data = read_sheet_as_dicts(client, sheet_id, _sheet_name_missions())
             if data:
                 return data
-    path = _csv_path("missions")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        return df.replace({pd.NA: None}).to_dict("records")
-    return []
+    return _read_csv_records("missions")
 
 
+@_ttl_cached("assignments")
 def load_assignments(client: Any = None) -> List[dict]:
     """
     Load assignments (project_id, pilot_id, drone_id, start_date, end_date).
@@ -102,15 +153,66 @@ def load_assignments(client: Any = None) -> List[dict]:
                     return data
             except RuntimeError:
                 pass  # fall back to CSV or []
-    path = _csv_path("assignments")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        return df.replace({pd.NA: None}).to_dict("records")
-    return []
+    return _read_csv_records("assignments")
+
+
+@_ttl_cached("all")
+def load_all_sheets(client: Any = None) -> tuple:
+    """
+    Load (pilots, drones, missions, assignments) together.
+    When a single workbook serves all four tabs, fetch them in one
+    values.batchGet round-trip instead of four; otherwise fall back to
+    the individual loaders (which handle per-sheet IDs and CSV).
+    """
+    if (
+        not config.USE_LOCAL_CSV
+        and client
+        and config.SINGLE_SHEET_ID
+        and not (
+            config.GOOGLE_SHEET_ID_PILOTS
+            or config.GOOGLE_SHEET_ID_DRONES
+            or config.GOOGLE_SHEET_ID_MISSIONS
+            or config.GOOGLE_SHEET_ID_ASSIGNMENTS
+        )
+    ):
+        names = [
+            _sheet_name_pilots(),
+            _sheet_name_drones(),
+            _sheet_name_missions(),
+            _sheet_name_assignments(),
+        ]
+        if all(names):
+            try:
+                data = read_sheets_batch(client, config.SINGLE_SHEET_ID, names)
+                # Empty tabs fall back to CSV, same as the individual loaders
+                return (
+                    data.get(names[0]) or load_pilots(None),
+                    data.get(names[1]) or load_drones(None),
+                    data.get(names[2]) or load_missions(None),
+                    data.get(names[3]) or load_assignments(None),
+                )
+            except RuntimeError:
+                pass  # fall through to individual loaders
+    return (
+        load_pilots(client),
+        load_drones(client),
+        load_missions(client),
+        load_assignments(client),
+    )
+
+
+# Process-wide client singleton: credentials read + auth happen once, not per call
+_client_singleton = None
+_client_lock = threading.Lock()
 
 
 def get_sheets_client_cached():
-    """Return sheets client if credentials exist; else None."""
+    """Return sheets client if credentials exist; else None. Authorizes once per process."""
+    global _client_singleton
     if config.USE_LOCAL_CSV and not (config.SINGLE_SHEET_ID or config.GOOGLE_SHEET_ID_PILOTS):
         return None
-    return get_sheets_client()
+    if _client_singleton is None:
+        with _client_lock:
+            if _client_singleton is None:
+                _client_singleton = get_sheets_client()
+    return _client_singleton
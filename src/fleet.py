@@ -1,9 +1,14 @@
 """
 Drone fleet inventory: query by capability, availability, location; maintenance flags.
 """
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime
 
+# Values meaning "no assignment": empty, ASCII hyphen, en/em dash, and the
+# mojibake en-dash produced when UTF-8 sheets are read as latin-1.
+_EMPTY_ASSIGN = frozenset({"", "-", "–", "—", "â€“"})
+
 
 def query_drones(
     drones: List[dict],
@@ -19,43 +24,51 @@ def query_drones(
     exclude_maintenance: only return status != Maintenance.
     maintenance_due_before: ISO date string; flag if maintenance_due <= that date.
     """
-    result = list(drones)
-    if capability:
-        result = [d for d in result if _has_cap(d.get("capabilities", ""), capability)]
-    if status:
-        result = [d for d in result if (d.get("status") or "").strip().lower() == status.strip().lower()]
-    if location:
-        result = [d for d in result if (d.get("location") or "").strip().lower() == location.strip().lower()]
-    if exclude_maintenance:
-        result = [d for d in result if (d.get("status") or "").strip().lower() != "maintenance"]
-    if maintenance_due_before:
-        result = [_add_maintenance_flag(d, maintenance_due_before) for d in result]
-    else:
-        result = [_add_maintenance_flag(d, None) for d in result]
-    return result
+    # Normalize filters once, then a single pass checks all active predicates
+    cap_l = capability.strip().lower() if capability else None
+    status_l = status.strip().lower() if status else None
+    loc_l = location.strip().lower() if location else None
+    result = [
+        d for d in drones
+        if (cap_l is None or cap_l in _cap_set(d))
+        and (status_l is None or (d.get("status") or "").strip().lower() == status_l)
+        and (loc_l is None or (d.get("location") or "").strip().lower() == loc_l)
+        and (not exclude_maintenance or (d.get("status") or "").strip().lower() != "maintenance")
+    ]
+    if not maintenance_due_before:
+        # Without a reference date every flag would be False and no caller
+        # reads it, so skip the per-drone dict copies entirely
+        return result
+    ref_ord = _safe_ord(maintenance_due_before)
+    return [{**d, "maintenance_flagged": _compute_maintenance_flag(d, ref_ord)} for d in result]
 
 
-def _has_cap(cell: str, cap: str) -> bool:
-    if not cell:
-        return False
-    parts = [s.strip().lower() for s in str(cell).split(",")]
-    return cap.strip().lower() in parts
+def _cap_set(d: dict) -> frozenset:
+    """Normalized capability token set, cached on the drone dict (shared sentinel key)."""
+    v = d.get("_capabilities_set")
+    if v is None:
+        v = frozenset(s.strip().lower() for s in str(d.get("capabilities") or "").split(",") if s.strip())
+        d["_capabilities_set"] = v
+    return v
 
 
-def _add_maintenance_flag(drone: dict, before_date: Optional[str]) -> dict:
-    """Add maintenance_flagged=True if maintenance_due is past or before given date."""
-    d = dict(drone)
-    due = (d.get("maintenance_due") or "").strip()
-    if not before_date or not due:
-        d["maintenance_flagged"] = False
-        return d
+@lru_cache(maxsize=512)
+def _safe_ord(s: Optional[str]) -> Optional[int]:
+    """Ordinal day for an ISO date string; None if missing/unparseable. Memoized."""
+    if not s:
+        return None
     try:
-        due_dt = datetime.strptime(due[:10], "%Y-%m-%d")
-        ref_dt = datetime.strptime(before_date[:10], "%Y-%m-%d")
-        d["maintenance_flagged"] = due_dt <= ref_dt
-    except Exception:
-        d["maintenance_flagged"] = False
-    return d
+        return datetime.strptime(s.strip()[:10], "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def _compute_maintenance_flag(drone: dict, ref_ord: Optional[int]) -> bool:
+    """True if maintenance_due is on or before the reference ordinal."""
+    if "_maintenance_due_ord" not in drone:
+        drone["_maintenance_due_ord"] = _safe_ord(drone.get("maintenance_due"))
+    due_ord = drone["_maintenance_due_ord"]
+    return ref_ord is not None and due_ord is not None and due_ord <= ref_ord
 
 
 def get_drone_by_id(drones: List[dict], drone_id: str) -> Optional[dict]:
@@ -71,7 +84,7 @@ def get_current_deployments_from_fleet(drones: List[dict]) -> List[dict]:
     out = []
     for d in drones:
         a = (d.get("current_assignment") or "").strip()
-        if a and a != "–" and a != "-":
+        if a not in _EMPTY_ASSIGN:
             out.append({"drone_id": d.get("drone_id"), "current_assignment": a})
     return out
 
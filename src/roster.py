@@ -3,6 +3,10 @@ Pilot roster management: query by skill, certification, location; update status.
 """
 from typing import List, Optional
 
+# Values meaning "no assignment": empty, ASCII hyphen, en/em dash, and the
+# mojibake en-dash produced when UTF-8 sheets are read as latin-1.
+_EMPTY_ASSIGN = frozenset({"", "-", "–", "—", "â€“"})
+
 
 def query_pilots(
     pilots: List[dict],
@@ -15,24 +19,32 @@ def query_pilots(
     Filter pilots by skill, certification, location, status.
     Skills/certs can be comma-separated in data; we check substring match.
     """
-    result = list(pilots)
-    if skill:
-        result = [p for p in result if _has_token(p.get("skills", ""), skill)]
-    if certification:
-        result = [p for p in result if _has_token(p.get("certifications", ""), certification)]
-    if location:
-        result = [p for p in result if (p.get("location") or "").strip().lower() == location.strip().lower()]
-    if status:
-        result = [p for p in result if (p.get("status") or "").strip().lower() == status.strip().lower()]
-    return result
-
-
-def _has_token(cell: str, token: str) -> bool:
-    """Check if token appears in comma-separated cell (case-insensitive)."""
-    if not cell:
-        return False
-    parts = [s.strip().lower() for s in str(cell).split(",")]
-    return token.strip().lower() in parts
+    # Normalize filters once, then a single pass checks all active predicates
+    skill_l = skill.strip().lower() if skill else None
+    cert_l = certification.strip().lower() if certification else None
+    loc_l = location.strip().lower() if location else None
+    status_l = status.strip().lower() if status else None
+    return [
+        p for p in pilots
+        if (skill_l is None or skill_l in _token_set(p, "skills"))
+        and (cert_l is None or cert_l in _token_set(p, "certifications"))
+        and (loc_l is None or (p.get("location") or "").strip().lower() == loc_l)
+        and (status_l is None or (p.get("status") or "").strip().lower() == status_l)
+    ]
+
+
+def _token_set(d: dict, field: str) -> frozenset:
+    """
+    Normalized token set for a comma-separated field, cached on the row dict
+    under the same sentinel key the assignment engine uses, so the split/lower
+    work happens once per row regardless of which module asks first.
+    """
+    key = "_" + field + "_set"
+    v = d.get(key)
+    if v is None:
+        v = frozenset(s.strip().lower() for s in str(d.get(field) or "").split(",") if s.strip())
+        d[key] = v
+    return v
 
 
 def get_pilot_by_id(pilots: List[dict], pilot_id: str) -> Optional[dict]:
@@ -48,7 +60,7 @@ def get_current_assignments_from_roster(pilots: List[dict]) -> List[dict]:
     out = []
     for p in pilots:
         a = (p.get("current_assignment") or "").strip()
-        if a and a != "–" and a != "-":
+        if a not in _EMPTY_ASSIGN:
             out.append({"pilot_id": p.get("pilot_id"), "current_assignment": a})
     return out
 
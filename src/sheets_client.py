@@ -4,12 +4,19 @@ Reads Pilot Roster, Drone Fleet, Missions, Assignments.
 Writes pilot status and drone status back to sheets.
 Explicit worksheet selection by name; normalized headers (strip, lowercase, spaces->underscore).
 """
+import functools
 import os
 import re
+import time
 from typing import Any, List, Optional
 
 import gspread
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import _extract_sheet_id
 
 # Will be set by config / env
 SCOPES = [
@@ -18,24 +25,40 @@ SCOPES = [
 ]
 
 
-def _extract_sheet_id(value: str) -> str:
-    """Extract sheet ID from URL or return as-is if already an ID."""
-    if not value or not value.strip():
-        return ""
-    value = value.strip()
-    m = re.search(r"/d/([a-zA-Z0-9_-]+)", value)
-    if m:
-        return m.group(1)
-    return value
+# Compiled once; header strings are tiny and repeat on every read/update of
+# the same sheet, so the memoized result turns the regex work into a dict hit.
+_WS_RE = re.compile(r"\s+")
 
 
+@functools.lru_cache(maxsize=512)
 def normalize_header(header: str) -> str:
     """Strip and normalize header for consistent key lookup: lowercase, spaces -> underscore."""
     if header is None:
         return ""
-    s = str(header).strip()
-    s = re.sub(r"\s+", "_", s).lower()
-    return s
+    return _WS_RE.sub("_", str(header).strip()).lower()
+
+
+def _build_session(creds) -> AuthorizedSession:
+    """
+    AuthorizedSession with connection pooling and automatic retry on rate
+    limits / transient 5xx. Every Sheets call hits the same host, so reusing
+    one pooled TLS connection avoids a handshake per request. POST/PUT are
+    included in the retry set: our writes set absolute cell values, so a
+    replay after a 429/500 is idempotent.
+    """
+    session = AuthorizedSession(creds)
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST", "PUT"}),
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    # Sheets JSON compresses ~5-10x; pin the header in case a proxy or env
+    # strips the default. Only encodings requests can decode everywhere —
+    # advertising brotli without a decoder installed would break responses.
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
 
 
 def get_sheets_client():
@@ -45,11 +68,114 @@ def get_sheets_client():
         return None
     try:
         creds = Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        return gspread.authorize(creds)
+        return gspread.authorize(creds, session=_build_session(creds))
     except Exception:
         return None
 
 
+# Workbook handles, worksheet handles, tab titles and normalized header rows
+# are cached per (client, sheet): the find-row/update pairs issued by sync
+# would otherwise re-open the workbook, re-fetch worksheet metadata and
+# re-download row 1 on every write.
+_workbook_cache: dict = {}
+_worksheet_cache: dict = {}
+_header_cache: dict = {}
+_titles_cache: dict = {}
+
+# id -> row maps per (client, sheet, tab, column), so updating several pilots
+# or drones in one run reads the key column once instead of once per entity.
+# Same 30s staleness window the data_loader cache accepts.
+_row_index_cache: dict = {}
+_ROW_INDEX_TTL_SECONDS = 30.0
+
+
+def _open_workbook(client: Any, sid: str):
+    """Open a workbook by key, reusing a cached handle for this client."""
+    key = (id(client), sid)
+    wb = _workbook_cache.get(key)
+    if wb is None:
+        wb = client.open_by_key(sid)
+        _workbook_cache[key] = wb
+    return wb
+
+
+def _worksheet_titles(client: Any, sid: str, workbook) -> set:
+    """Tab titles of a workbook, fetched once per (client, sheet)."""
+    key = (id(client), sid)
+    titles = _titles_cache.get(key)
+    if titles is None:
+        titles = {w.title for w in workbook.worksheets()}
+        _titles_cache[key] = titles
+    return titles
+
+
+def _open_worksheet(client: Any, sid: str, workbook, sheet_name: Optional[str]):
+    """Worksheet handle by title (first sheet when None), cached per (client, sheet, tab)."""
+    key = (id(client), sid, sheet_name)
+    sheet = _worksheet_cache.get(key)
+    if sheet is None:
+        sheet = workbook.worksheet(sheet_name) if sheet_name else workbook.sheet1
+        _worksheet_cache[key] = sheet
+    return sheet
+
+
+def _normalized_headers(sheet, cache_key) -> List[str]:
+    """Normalized header row for a worksheet, fetched once and cached."""
+    headers = _header_cache.get(cache_key)
+    if headers is None:
+        headers = [normalize_header(h) for h in sheet.row_values(1)]
+        _header_cache[cache_key] = headers
+    return headers
+
+
+def _values_to_dicts(all_values: List[List[str]]) -> List[dict]:
+    """Convert a raw values grid (header row + data rows) to dicts with normalized keys."""
+    if not all_values or not all_values[0]:
+        return []
+    headers_normalized = [normalize_header(h) for h in all_values[0]]
+    n = len(headers_normalized)
+    records = []
+    for row in all_values[1:]:
+        if len(row) < n:
+            row = row + [""] * (n - len(row))
+        # zip truncates over-long rows to the header count, as before
+        records.append({
+            k: (v.strip() if isinstance(v, str) else v)
+            for k, v in zip(headers_normalized, row)
+        })
+    return records
+
+
+def read_sheets_batch(client: Any, sheet_id: str, sheet_names: List[str]) -> dict:
+    """
+    Read several worksheets of one workbook in a single values.batchGet round-trip.
+    Returns {sheet_name: list of dicts with normalized keys}; missing tabs map to [].
+    Fails loudly (RuntimeError) if the workbook cannot be read.
+    """
+    if not client or not sheet_id or not sheet_names:
+        return {name: [] for name in sheet_names or []}
+    sid = _extract_sheet_id(sheet_id)
+    if not sid:
+        return {name: [] for name in sheet_names}
+    try:
+        workbook = _open_workbook(client, sid)
+        # Quote tab titles ("Pilot Roster" -> "'Pilot Roster'"): A1 notation
+        # requires it for names with spaces; responses map back by order.
+        ranges = [gspread.utils.absolute_range_name(name) for name in sheet_names]
+        result = workbook.values_batch_get(ranges=ranges)
+        out = {}
+        value_ranges = result.get("valueRanges", [])
+        for name, vr in zip(sheet_names, value_ranges):
+            out[name] = _values_to_dicts(vr.get("values", []))
+        for name in sheet_names:
+            out.setdefault(name, [])
+        return out
+    except Exception as e:
+        raise RuntimeError(
+            f"Google Sheets batchGet failed: sheet_id={sid!r}, ranges={sheet_names!r}. {e}"
+        ) from e
+
+
 def read_sheet_as_dicts(
     client: Any,
     sheet_id: str,
@@ -70,39 +196,24 @@ def read_sheet_as_dicts(
     if not sid:
         return []
     try:
-        workbook = client.open_by_key(sid)
+        workbook = _open_workbook(client, sid)
         if sheet_name:
-            try:
-                sheet = workbook.worksheet(sheet_name)
-            except Exception as e:
+            # Explicit title check against the cached tab list: a miss costs a
+            # set lookup, not an API 404 plus a raised-and-caught exception
+            if sheet_name not in _worksheet_titles(client, sid, workbook):
                 raise RuntimeError(
                     f"Worksheet not found: sheet_id={sid!r}, worksheet_name={sheet_name!r}. "
-                    f"Check SHEET_NAME_* matches the tab name exactly. Original: {e}"
-                ) from e
-        else:
-            sheet = workbook.sheet1
-        raw_headers = sheet.row_values(1)
-        if not raw_headers:
+                    f"Check SHEET_NAME_* matches the tab name exactly."
+                )
+        sheet = _open_worksheet(client, sid, workbook, sheet_name)
+        all_values = sheet.get_all_values()
+        if not all_values or not all_values[0]:
             return []
-        headers_normalized = [normalize_header(h) for h in raw_headers]
         if _log_headers:
+            raw_headers = all_values[0]
             print(f"  [Sheets] Detected headers (raw): {raw_headers}")
-            print(f"  [Sheets] Normalized keys: {headers_normalized}")
-        all_values = sheet.get_all_values()
-        if len(all_values) < 2:
-            return []
-        records = []
-        for row in all_values[1:]:
-            row_padded = row + [""] * (len(headers_normalized) - len(row))
-            record = {}
-            for i, key in enumerate(headers_normalized):
-                if i < len(row_padded):
-                    val = row_padded[i]
-                    record[key] = val.strip() if isinstance(val, str) else val
-                else:
-                    record[key] = ""
-            records.append(record)
-        return records
+            print(f"  [Sheets] Normalized keys: {[normalize_header(h) for h in raw_headers]}")
+        return _values_to_dicts(all_values)
     except RuntimeError:
         raise
     except Exception as e:
@@ -119,8 +230,8 @@ def write_cell(client: Any, sheet_id: str, sheet_name: Optional[str], row: int,
     if not sid:
         return False
     try:
-        workbook = client.open_by_key(sid)
-        sheet = workbook.worksheet(sheet_name) if sheet_name else workbook.sheet1
+        workbook = _open_workbook(client, sid)
+        sheet = _open_worksheet(client, sid, workbook, sheet_name)
         sheet.update_cell(row, col, str(value))
         return True
     except Exception:
@@ -132,16 +243,12 @@ def _get_worksheet(client: Any, sheet_id: str, sheet_name: Optional[str]):
     sid = _extract_sheet_id(sheet_id)
     if not sid:
         return None, None
-    workbook = client.open_by_key(sid)
-    if sheet_name:
-        try:
-            sheet = workbook.worksheet(sheet_name)
-        except Exception as e:
-            raise RuntimeError(
-                f"Worksheet not found: sheet_id={sid!r}, worksheet_name={sheet_name!r}. {e}"
-            ) from e
-    else:
-        sheet = workbook.sheet1
+    workbook = _open_workbook(client, sid)
+    if sheet_name and sheet_name not in _worksheet_titles(client, sid, workbook):
+        raise RuntimeError(
+            f"Worksheet not found: sheet_id={sid!r}, worksheet_name={sheet_name!r}."
+        )
+    sheet = _open_worksheet(client, sid, workbook, sheet_name)
     return sheet, sid
 
 
@@ -150,22 +257,28 @@ def find_row_by_column(client: Any, sheet_id: str, sheet_name: Optional[str], co
     if not client or not sheet_id:
         return 0
     try:
-        sheet, _ = _get_worksheet(client, sheet_id, sheet_name)
+        sheet, sid = _get_worksheet(client, sheet_id, sheet_name)
         if not sheet:
             return 0
-        headers = sheet.row_values(1)
-        headers_norm = [normalize_header(h) for h in headers]
+        headers_norm = _normalized_headers(sheet, (id(client), sid, sheet_name))
         col_norm = normalize_header(col_name)
         if col_norm not in headers_norm:
             return 0
         col_idx = headers_norm.index(col_norm)
-        all_values = sheet.get_all_values()
         value_stripped = str(value).strip()
-        for i, row in enumerate(all_values[1:], start=2):
-            row_padded = row + [""] * (len(headers_norm) - len(row))
-            if col_idx < len(row_padded) and str(row_padded[col_idx] or "").strip() == value_stripped:
-                return i
-        return 0
+        cache_key = (id(client), sid, sheet_name, col_norm)
+        cached = _row_index_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _ROW_INDEX_TTL_SECONDS:
+            return cached[1].get(value_stripped, 0)
+        # Fetch only the key column: a few KB instead of the whole grid.
+        # (gspread's find() scans client-side anyway, so this is the cheapest path.)
+        index = {}
+        for i, cell in enumerate(sheet.col_values(col_idx + 1)[1:], start=2):
+            key = str(cell or "").strip()
+            if key and key not in index:  # first occurrence wins, like the scan did
+                index[key] = i
+        _row_index_cache[cache_key] = (time.monotonic(), index)
+        return index.get(value_stripped, 0)
     except RuntimeError:
         raise
     except Exception:
@@ -179,11 +292,10 @@ def update_column_for_row(
     if not client or row < 2 or not sheet_id:
         return False
     try:
-        sheet, _ = _get_worksheet(client, sheet_id, sheet_name)
+        sheet, sid = _get_worksheet(client, sheet_id, sheet_name)
         if not sheet:
             return False
-        headers = sheet.row_values(1)
-        headers_norm = [normalize_header(h) for h in headers]
+        headers_norm = _normalized_headers(sheet, (id(client), sid, sheet_name))
         col_norm = normalize_header(col_name)
         if col_norm not in headers_norm:
             return False
@@ -194,3 +306,42 @@ def update_column_for_row(
         raise
     except Exception:
         return False
+
+
+def update_row_by_match(
+    client: Any,
+    sheet_id: str,
+    sheet_name: Optional[str],
+    match_col: str,
+    match_value: str,
+    updates: dict,
+) -> tuple[int, bool]:
+    """
+    Find the row where match_col equals match_value, then write every column in
+    updates ({col_name: value}) in a single batch_update call, instead of one
+    update_cell round-trip per column. Returns (row, ok); row is 0 when no
+    match was found.
+    """
+    row = find_row_by_column(client, sheet_id, sheet_name, match_col, match_value)
+    if row == 0:
+        return 0, False
+    try:
+        sheet, sid = _get_worksheet(client, sheet_id, sheet_name)
+        if not sheet:
+            return row, False
+        headers_norm = _normalized_headers(sheet, (id(client), sid, sheet_name))
+        data = []
+        for col_name, value in updates.items():
+            col_norm = normalize_header(col_name)
+            if col_norm not in headers_norm:
+                return row, False
+            a1 = gspread.utils.rowcol_to_a1(row, headers_norm.index(col_norm) + 1)
+            data.append({"range": a1, "values": [[str(value)]]})
+        # update_cell writes USER_ENTERED; keep that for the batched path too
+        # (batch_update defaults to RAW, which would store dates/numbers as text)
+        sheet.batch_update(data, value_input_option="USER_ENTERED")
+        return row, True
+    except RuntimeError:
+        raise
+    except Exception:
+        return row, False
@@ -9,21 +9,45 @@ from typing import Optional
 import pandas as pd
 
 import config
-from src.data_loader import _sheet_name_pilots, _sheet_name_drones
-from src.sheets_client import (
-    get_sheets_client,
-    find_row_by_column,
-    update_column_for_row,
+from src.data_loader import (
+    _sheet_name_pilots,
+    _sheet_name_drones,
+    get_sheets_client_cached,
+    invalidate_cache,
 )
+from src.sheets_client import update_row_by_match
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Allowed status values (mirrors roster.valid_statuses / fleet.valid_drone_statuses)
+_PILOT_STATUSES = frozenset({"Available", "On Leave", "Unavailable", "Assigned"})
+_DRONE_STATUSES = frozenset({"Available", "Maintenance", "Assigned", "Unavailable"})
+
+# Optional callback fired after any successful write, so callers holding
+# cached copies of the data (e.g. the Streamlit UI) can invalidate them.
+_on_data_changed = None
+
+
+def set_on_data_changed(callback) -> None:
+    """Register a callback invoked after each successful status/assignment write."""
+    global _on_data_changed
+    _on_data_changed = callback
+
+
+def _data_changed() -> None:
+    invalidate_cache()  # loader TTL cache must never serve pre-write data
+    if _on_data_changed:
+        try:
+            _on_data_changed()
+        except Exception:
+            pass  # invalidation is best-effort; never fail the write
+
 
 def update_pilot_status(pilot_id: str, new_status: str) -> tuple[bool, str]:
     """
     Update pilot status in Google Sheet or CSV. Returns (success, message).
     """
-    if new_status not in ["Available", "On Leave", "Unavailable", "Assigned"]:
+    if new_status not in _PILOT_STATUSES:
         return False, "Invalid status."
 
     if config.USE_LOCAL_CSV or not (config.SINGLE_SHEET_ID or config.GOOGLE_SHEET_ID_PILOTS):
@@ -32,29 +56,31 @@ def update_pilot_status(pilot_id: str, new_status: str) -> tuple[bool, str]:
         if not path.exists():
             return False, "pilot_roster.csv not found."
         try:
-            df = pd.read_csv(path)
+            # dtype=str skips type inference and round-trips values verbatim
+            df = pd.read_csv(path, dtype=str, engine="c", keep_default_na=False)
             if "pilot_id" not in df.columns or "status" not in df.columns:
                 return False, "CSV must have pilot_id and status columns."
-            mask = df["pilot_id"].astype(str).str.strip() == str(pilot_id).strip()
+            mask = df["pilot_id"].str.strip() == str(pilot_id).strip()
             if not mask.any():
                 return False, f"Pilot {pilot_id} not found."
             df.loc[mask, "status"] = new_status
             df.to_csv(path, index=False)
+            _data_changed()
             return True, f"Pilot {pilot_id} status set to {new_status} (saved to CSV)."
         except Exception as e:
             return False, str(e)
 
-    client = get_sheets_client()
+    client = get_sheets_client_cached()
     if not client:
         return False, "Google Sheets not configured (no credentials)."
 
     sheet_id = config.GOOGLE_SHEET_ID_PILOTS or config.SINGLE_SHEET_ID
     sheet_name = _sheet_name_pilots()
-    row = find_row_by_column(client, sheet_id, sheet_name, "pilot_id", pilot_id)
+    row, ok = update_row_by_match(client, sheet_id, sheet_name, "pilot_id", pilot_id, {"status": new_status})
     if row == 0:
         return False, f"Pilot {pilot_id} not found in sheet."
-    ok = update_column_for_row(client, sheet_id, sheet_name, row, "status", new_status)
     if ok:
+        _data_changed()
         return True, f"Pilot {pilot_id} status set to {new_status} (synced to Google Sheet)."
     return False, "Failed to update sheet."
 
@@ -69,38 +95,41 @@ def update_pilot_assignment(pilot_id: str, project_id: Optional[str]) -> tuple[b
         if not path.exists():
             return False, "pilot_roster.csv not found."
         try:
-            df = pd.read_csv(path)
+            df = pd.read_csv(path, dtype=str, engine="c", keep_default_na=False)
             for col in ["current_assignment", "status"]:
                 if col not in df.columns:
                     df[col] = "–" if col == "current_assignment" else "Available"
-            mask = df["pilot_id"].astype(str).str.strip() == str(pilot_id).strip()
+            mask = df["pilot_id"].str.strip() == str(pilot_id).strip()
             if not mask.any():
                 return False, f"Pilot {pilot_id} not found."
             df.loc[mask, "current_assignment"] = value
             df.loc[mask, "status"] = status
             df.to_csv(path, index=False)
+            _data_changed()
             return True, f"Pilot {pilot_id} assignment set to {value} (CSV)."
         except Exception as e:
             return False, str(e)
 
-    client = get_sheets_client()
+    client = get_sheets_client_cached()
     if not client:
         return False, "Google Sheets not configured."
     sheet_id = config.GOOGLE_SHEET_ID_PILOTS or config.SINGLE_SHEET_ID
     sheet_name = _sheet_name_pilots()
-    row = find_row_by_column(client, sheet_id, sheet_name, "pilot_id", pilot_id)
+    row, ok = update_row_by_match(
+        client, sheet_id, sheet_name, "pilot_id", pilot_id,
+        {"current_assignment": value, "status": status},
+    )
     if row == 0:
         return False, f"Pilot {pilot_id} not found."
-    ok1 = update_column_for_row(client, sheet_id, sheet_name, row, "current_assignment", value)
-    ok2 = update_column_for_row(client, sheet_id, sheet_name, row, "status", status)
-    if ok1 and ok2:
+    if ok:
+        _data_changed()
         return True, f"Pilot {pilot_id} assignment synced to sheet."
     return False, "Failed to update sheet."
 
 
 def update_drone_status(drone_id: str, new_status: str) -> tuple[bool, str]:
     """Update drone status in Google Sheet or CSV."""
-    if new_status not in ["Available", "Maintenance", "Assigned", "Unavailable"]:
+    if new_status not in _DRONE_STATUSES:
         return False, "Invalid status."
 
     if config.USE_LOCAL_CSV or not (config.SINGLE_SHEET_ID or config.GOOGLE_SHEET_ID_DRONES):
@@ -108,28 +137,29 @@ def update_drone_status(drone_id: str, new_status: str) -> tuple[bool, str]:
         if not path.exists():
             return False, "drone_fleet.csv not found."
         try:
-            df = pd.read_csv(path)
+            df = pd.read_csv(path, dtype=str, engine="c", keep_default_na=False)
             if "drone_id" not in df.columns or "status" not in df.columns:
                 return False, "CSV must have drone_id and status columns."
-            mask = df["drone_id"].astype(str).str.strip() == str(drone_id).strip()
+            mask = df["drone_id"].str.strip() == str(drone_id).strip()
             if not mask.any():
                 return False, f"Drone {drone_id} not found."
             df.loc[mask, "status"] = new_status
             df.to_csv(path, index=False)
+            _data_changed()
             return True, f"Drone {drone_id} status set to {new_status} (CSV)."
         except Exception as e:
             return False, str(e)
 
-    client = get_sheets_client()
+    client = get_sheets_client_cached()
     if not client:
         return False, "Google Sheets not configured."
     sheet_id = config.GOOGLE_SHEET_ID_DRONES or config.SINGLE_SHEET_ID
     sheet_name = _sheet_name_drones()
-    row = find_row_by_column(client, sheet_id, sheet_name, "drone_id", drone_id)
+    row, ok = update_row_by_match(client, sheet_id, sheet_name, "drone_id", drone_id, {"status": new_status})
     if row == 0:
         return False, f"Drone {drone_id} not found in sheet."
-    ok = update_column_for_row(client, sheet_id, sheet_name, row, "status", new_status)
     if ok:
+        _data_changed()
         return True, f"Drone {drone_id} status set to {new_status} (synced to Google Sheet)."
     return False, "Failed to update sheet."
 
@@ -144,30 +174,33 @@ def update_drone_assignment(drone_id: str, project_id: Optional[str]) -> tuple[b
         if not path.exists():
             return False, "drone_fleet.csv not found."
         try:
-            df = pd.read_csv(path)
+            df = pd.read_csv(path, dtype=str, engine="c", keep_default_na=False)
             for col in ["current_assignment", "status"]:
                 if col not in df.columns:
                     df[col] = "–" if col == "current_assignment" else "Available"
-            mask = df["drone_id"].astype(str).str.strip() == str(drone_id).strip()
+            mask = df["drone_id"].str.strip() == str(drone_id).strip()
             if not mask.any():
                 return False, f"Drone {drone_id} not found."
             df.loc[mask, "current_assignment"] = value
             df.loc[mask, "status"] = status
             df.to_csv(path, index=False)
+            _data_changed()
             return True, f"Drone {drone_id} assignment set to {value} (CSV)."
         except Exception as e:
             return False, str(e)
 
-    client = get_sheets_client()
+    client = get_sheets_client_cached()
     if not client:
         return False, "Google Sheets not configured."
     sheet_id = config.GOOGLE_SHEET_ID_DRONES or config.SINGLE_SHEET_ID
     sheet_name = _sheet_name_drones()
-    row = find_row_by_column(client, sheet_id, sheet_name, "drone_id", drone_id)
+    row, ok = update_row_by_match(
+        client, sheet_id, sheet_name, "drone_id", drone_id,
+        {"current_assignment": value, "status": status},
+    )
     if row == 0:
         return False, f"Drone {drone_id} not found."
-    ok1 = update_column_for_row(client, sheet_id, sheet_name, row, "current_assignment", value)
-    ok2 = update_column_for_row(client, sheet_id, sheet_name, row, "status", status)
-    if ok1 and ok2:
+    if ok:
+        _data_changed()
         return True, f"Drone {drone_id} assignment synced to sheet."
     return False, "Failed to update sheet."